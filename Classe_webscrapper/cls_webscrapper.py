@@ -1,11 +1,12 @@
+import csv
 import os
+import subprocess
+import threading
 import time
 import datetime as dt
 from datetime import datetime
 from typing import Dict, Optional
-import pytz
-import re
-import logging
+from zoneinfo import ZoneInfo
 
 from bs4 import BeautifulSoup
 from selenium.webdriver.support.ui import WebDriverWait
@@ -21,9 +22,53 @@ from webdriver_manager.chrome import ChromeDriverManager
 import undetected_chromedriver as uc
 
 from logger import setup_logger
-from app import SCRAP_DURATION
 
 class ImprovedWebScraper:
+    # Number of scraped rows buffered in memory before flushing to the CSV file.
+    WRITE_BATCH_SIZE = 32
+
+    # Column order of the output CSV; rows are built as matching tuples.
+    CSV_HEADER = ("Timestamp", "Value X", "Value Bets", "Value Prize", "Value Players")
+
+    # Timezone used for all timestamps; resolved once instead of per call.
+    _TZ = ZoneInfo('Africa/Casablanca')
+
+    # Deletion table used to strip the trailing 'x' from the multiplier text.
+    _X_STRIP = str.maketrans('', '', 'x')
+
+    # Resolved chromedriver path, shared by all instances in this process.
+    _driver_path: Optional[str] = None
+
+    # Third-party and static resources that only slow down page readiness.
+    BLOCKED_URL_PATTERNS = [
+        "*googletagmanager*",
+        "*doubleclick*",
+        "*google-analytics*",
+        "*hotjar*",
+        "*.png",
+        "*.jpg",
+        "*.gif",
+        "*.woff*",
+    ]
+
+    # Selector for the multiplier counter; also used to detect round changes.
+    X_SELECTOR = "text.crash-game__counter[font-size='83'][x='1160'][y='356']"
+    BETS_SELECTOR = "span.crash-total__value.crash-total__value--bets.crash-text"
+    PRIZE_SELECTOR = "span.crash-total__value.crash-total__value--prize.crash-text"
+    PLAYERS_SELECTOR = "span.crash-total__value.crash-total__value--players.crash-text"
+
+    # Fetches all four values in one round-trip to chromedriver instead of
+    # one find_element HTTP request per field.
+    EXTRACT_SCRIPT = """
+        const q = s => ((document.querySelector(s) || {}).textContent || "");
+        return [q(arguments[0]), q(arguments[1]), q(arguments[2]), q(arguments[3])];
+    """
+
+    # Cheap probe for the multiplier text alone, used for change detection.
+    PEEK_X_SCRIPT = """
+        return ((document.querySelector(arguments[0]) || {}).textContent || "").trim();
+    """
+
     def __init__(self, duration: int = 180, live_prediction: bool = False) -> None:
         """
         Initialize the ImprovedWebScraper instance.
@@ -37,6 +82,8 @@ class ImprovedWebScraper:
         self.start_time = time.time()
         self.url_crash_plane = ""
         self.driver = None
+        self._stop_event = threading.Event()
+        self._last_x_text = ""
 
         # Set up logger
         self.logger = setup_logger('ImprovedWebScraper', self.get_log_file_name())
@@ -51,8 +98,16 @@ class ImprovedWebScraper:
 
         options = uc.ChromeOptions()
         # Run in headless mode in server environments
-        options.headless = False
+        options.headless = True
+        options.add_argument("--headless=new")
         options.add_argument("--window-size=1920x1080")
+        # Data extraction does not need the pixel pipeline: skip images and
+        # stylesheets to cut memory and page-load bandwidth.
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.stylesheets": 2,
+        })
         user_agent = (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
             "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
@@ -64,23 +119,90 @@ class ImprovedWebScraper:
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--disable-gpu')
+        # The crash iframe streams continuously and may never fire 'load', so
+        # let .get() return immediately; the explicit waits drive readiness.
+        options.page_load_strategy = "none"
 
         try:
-            # Use webdriver_manager to automatically install the correct driver
-            driver_path = ChromeDriverManager().install()
+            driver_path = self._resolve_driver_path()
             self.driver = uc.Chrome(options=options, driver_executable_path=driver_path)
+            self._block_irrelevant_requests()
             self.logger.info("Chrome driver setup complete with webdriver_manager.")
         except WebDriverException as e:
             self.logger.error(f"Error initializing Chrome driver: {e}")
             raise
 
+    def _resolve_driver_path(self) -> str:
+        """
+        Resolves the chromedriver executable path, caching the result both on
+        the class (for repeated instances in one process) and on disk keyed by
+        the installed Chrome major version (for restarted subprocesses), so
+        webdriver_manager's network check only runs on a cache miss.
+
+        Returns:
+            str: Path to the chromedriver executable.
+        """
+        if ImprovedWebScraper._driver_path and os.path.isfile(ImprovedWebScraper._driver_path):
+            return ImprovedWebScraper._driver_path
+
+        cache_file = os.path.join(
+            os.path.expanduser("~/.cache/scraper"),
+            f"chromedriver_{self._chrome_major_version()}",
+        )
+        if os.path.isfile(cache_file):
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached_path = f.read().strip()
+            if os.path.isfile(cached_path):
+                self.logger.info(f"Reusing cached chromedriver path: {cached_path}")
+                ImprovedWebScraper._driver_path = cached_path
+                return cached_path
+
+        # Cache miss: let webdriver_manager resolve and download the driver
+        driver_path = ChromeDriverManager().install()
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            f.write(driver_path)
+        ImprovedWebScraper._driver_path = driver_path
+        return driver_path
+
+    def _chrome_major_version(self) -> str:
+        """
+        Returns the installed Chrome major version, or 'unknown' if it cannot
+        be determined.
+
+        Returns:
+            str: The Chrome major version number as a string.
+        """
+        try:
+            output = subprocess.check_output(["google-chrome", "--version"], text=True)
+            # e.g. "Google Chrome 115.0.5790.170" -> "115"
+            return output.strip().split()[-1].split('.')[0]
+        except (OSError, subprocess.SubprocessError, IndexError):
+            return "unknown"
+
+    def _block_irrelevant_requests(self) -> None:
+        """
+        Uses the Chrome DevTools Protocol to block analytics/ads and static
+        assets so the page reaches a scrapable state sooner.
+        """
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd(
+                "Network.setBlockedURLs", {"urls": self.BLOCKED_URL_PATTERNS}
+            )
+            self.logger.info("Blocked analytics and static-asset URL patterns via CDP.")
+        except WebDriverException as e:
+            # Blocking is an optimization; scraping still works without it
+            self.logger.warning(f"Could not set up CDP request blocking: {e}")
+
     def search_for_url(self) -> str:
         """
         Searches for the crash game URL by loading the base page and extracting the iframe src.
         The iframe with class 'games-project-frame__item' contains the game's URL in its src attribute.
 
         Returns:
-            str: The extracted crash game URL.
+            str: The extracted crash game URL, or an empty string when a stop
+            was requested during the search.
 
         Raises:
             NoSuchElementException: If the game iframe or its src cannot be found.
@@ -90,9 +212,11 @@ class ImprovedWebScraper:
         try:
             self.driver.get(base_url)
             # Wait until the iframe is present on the page
-            WebDriverWait(self.driver, 30).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "iframe.games-project-frame__item"))
-            )
+            if not self._wait_or_stop(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "iframe.games-project-frame__item")), 30
+            ):
+                self.logger.info("Stop requested while searching for the crash game URL.")
+                return ""
 
             # Locate the iframe and extract its 'src'
             iframe = self.driver.find_element(By.CSS_SELECTOR, "iframe.games-project-frame__item")
@@ -113,14 +237,14 @@ class ImprovedWebScraper:
 
         except (NoSuchElementException, TimeoutException) as e:
             self.logger.warning(f"Encountered an issue loading {base_url}, retrying: {e}")
-            time.sleep(2)
-            # Retry once
-            self.driver.get(base_url)
-            time.sleep(5)
+            # Retry once; the explicit wait below replaces fixed recovery sleeps
+            self.driver.refresh()
             try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "iframe.games-project-frame__item"))
-                )
+                if not self._wait_or_stop(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "iframe.games-project-frame__item")), 10
+                ):
+                    self.logger.info("Stop requested while searching for the crash game URL.")
+                    return ""
                 iframe = self.driver.find_element(By.CSS_SELECTOR, "iframe.games-project-frame__item")
                 iframe_src = iframe.get_attribute('src')
 
@@ -151,20 +275,85 @@ class ImprovedWebScraper:
             dict: A dictionary containing the extracted data fields.
         """
         self.logger.debug("Extracting data from page elements.")
-        elements = {
-            "Value X": "text.crash-game__counter[font-size='83'][x='1160'][y='356']",
-            "Value Bets": "span.crash-total__value.crash-total__value--bets.crash-text",
-            "Value Prize": "span.crash-total__value.crash-total__value--prize.crash-text",
-            "Value Players": "span.crash-total__value.crash-total__value--players.crash-text"
-        }
         data = {}
         try:
-            for key, selector in elements.items():
-                element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                data[key] = element.text.strip()
+            values = self.driver.execute_script(
+                self.EXTRACT_SCRIPT,
+                self.X_SELECTOR,
+                self.BETS_SELECTOR,
+                self.PRIZE_SELECTOR,
+                self.PLAYERS_SELECTOR,
+            )
+            data = {
+                "Value X": values[0].strip(),
+                "Value Bets": values[1].strip(),
+                "Value Prize": values[2].strip(),
+                "Value Players": values[3].strip(),
+            }
             self.logger.debug(f"Extracted data: {data}")
-        except NoSuchElementException as e:
-            self.logger.warning(f"One or more elements not found: {e}")
+        except WebDriverException as e:
+            self.logger.warning(f"Script extraction failed, parsing page snapshot instead: {e}")
+            data = self._extract_from_snapshot()
+        return data
+
+    def _wait_or_stop(self, condition, timeout: float, poll_frequency: float = 0.5) -> bool:
+        """
+        Blocks on a WebDriverWait condition but also wakes on the stop event,
+        so a stop request takes effect within one poll interval instead of
+        waiting out the full timeout.
+
+        Args:
+            condition: Predicate taking the driver, as passed to until().
+            timeout (float): Maximum seconds to wait for the condition.
+            poll_frequency (float): Seconds between predicate evaluations.
+
+        Returns:
+            bool: True if the condition was met, False if stop was requested.
+
+        Raises:
+            TimeoutException: If neither happened within the timeout.
+        """
+        WebDriverWait(self.driver, timeout, poll_frequency=poll_frequency).until(
+            lambda d: self._stop_event.is_set() or condition(d)
+        )
+        return not self._stop_event.is_set()
+
+    def _peek_x_value(self) -> str:
+        """
+        Reads only the multiplier text in a single script call, used to detect
+        whether the page state changed since the last full extraction.
+
+        Returns:
+            str: The current multiplier text, or "" when unavailable.
+        """
+        try:
+            return self.driver.execute_script(self.PEEK_X_SCRIPT, self.X_SELECTOR)
+        except WebDriverException:
+            return ""
+
+    def _extract_from_snapshot(self) -> Dict[str, str]:
+        """
+        Fallback extraction path: fetch a single page_source snapshot and parse
+        it locally with BeautifulSoup. Still only one Selenium round-trip, used
+        when script injection is unavailable.
+
+        Returns:
+            dict: A dictionary containing the extracted data fields.
+        """
+        data = {}
+        try:
+            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            for key, selector in (
+                ("Value X", self.X_SELECTOR),
+                ("Value Bets", self.BETS_SELECTOR),
+                ("Value Prize", self.PRIZE_SELECTOR),
+                ("Value Players", self.PLAYERS_SELECTOR),
+            ):
+                node = soup.select_one(selector)
+                data[key] = node.get_text(strip=True) if node else ""
+            self.logger.debug(f"Extracted data from snapshot: {data}")
+        except WebDriverException as e:
+            self.logger.warning(f"Failed to take page snapshot: {e}")
             # Return partial or empty data to handle gracefully
         return data
 
@@ -173,44 +362,83 @@ class ImprovedWebScraper:
         Extracts data from the given URL and writes it to a CSV file.
 
         The extracted fields are: Timestamp, Value X, Value Bets, Value Prize, and Value Players.
+        Rows are buffered in memory and flushed to disk in batches to avoid one
+        write syscall per scraped sample.
 
         Args:
             url (str): The URL of the page to scrape.
         """
         self.logger.info(f"Fetching data from URL: {url}")
         try:
+            # No load sleep needed: the svg-presence wait in the loop below is
+            # the real readiness signal
             self.driver.get(url)
-            time.sleep(5)  # Wait for the page to load completely
 
             output_file = self.get_output_file_name()
             self.logger.info(f"Writing scraped data to: {output_file}")
 
-            with open(output_file, "w", encoding='utf-8') as file:
-                file.write("Timestamp,Value X,Value Bets,Value Prize,Value Players\n")
-
-                while time.time() - self.start_time < self.duration:
-                    try:
-                        # Wait for required elements
-                        WebDriverWait(self.driver, 30).until(
-                            EC.presence_of_all_elements_located((By.TAG_NAME, 'svg'))
-                        )
-
-                        # Extract data
-                        data = self.extract_data()
-                        if not data or data.get('Value X', "") == "":
-                            self.logger.debug("No valid data found or Value X empty, waiting before retrying.")
-                            time.sleep(3)
-                            continue
-
-                        timestamp = self.get_timestamp()
-                        line = f"{timestamp},{data['Value X'].replace('x','')},{data['Value Bets']},{data['Value Prize']},{data['Value Players']}\n"
-                        file.write(line)
-                        self.logger.info(f"Data extracted and written: {line.strip()}")
-                        time.sleep(0.8)
-
-                    except NoSuchElementException:
-                        self.logger.warning("The crash plane URL changed or elements not found.")
-                        break
+            with open(output_file, "w", encoding='utf-8', buffering=1 << 20, newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(self.CSV_HEADER)
+                buffer = []
+
+                try:
+                    while (time.time() - self.start_time < self.duration
+                           and not self._stop_event.is_set()):
+                        try:
+                            # Wait for required elements; wakes early on stop
+                            if not self._wait_or_stop(
+                                EC.presence_of_all_elements_located((By.TAG_NAME, 'svg')), 30
+                            ):
+                                break
+
+                            # Block until the multiplier actually changes: one
+                            # cheap probe per poll instead of re-running the
+                            # full extraction on an unchanged DOM.
+                            if self._last_x_text:
+                                try:
+                                    if not self._wait_or_stop(
+                                        lambda d: self._peek_x_value() != self._last_x_text,
+                                        5,
+                                        poll_frequency=0.2,
+                                    ):
+                                        break
+                                except TimeoutException:
+                                    # Still the same value; resample without
+                                    # appending a duplicate row
+                                    continue
+
+                            # Extract data
+                            data = self.extract_data()
+                            if not data or data.get('Value X', "") == "":
+                                self.logger.debug("No valid data found or Value X empty, waiting before retrying.")
+                                time.sleep(3)
+                                continue
+
+                            # One timezone-aware now() per row, formatted inline
+                            timestamp = datetime.now(self._TZ).strftime('%Y-%m-%d %H:%M:%S')
+                            row = (
+                                timestamp,
+                                data['Value X'].translate(self._X_STRIP),
+                                data['Value Bets'],
+                                data['Value Prize'],
+                                data['Value Players'],
+                            )
+                            buffer.append(row)
+                            if len(buffer) >= self.WRITE_BATCH_SIZE:
+                                writer.writerows(buffer)
+                                buffer.clear()
+                            self._last_x_text = data['Value X']
+                            self.logger.info(f"Data extracted: {','.join(row)}")
+
+                        except NoSuchElementException:
+                            self.logger.warning("The crash plane URL changed or elements not found.")
+                            break
+                finally:
+                    # Flush any rows still buffered when the session ends or fails
+                    if buffer:
+                        writer.writerows(buffer)
+                        buffer.clear()
 
             self.logger.info("Data fetching completed successfully.")
         except Exception as e:
@@ -223,7 +451,7 @@ class ImprovedWebScraper:
         Returns:
             str: The formatted timestamp.
         """
-        morocco_time = datetime.now(pytz.timezone('Africa/Casablanca'))
+        morocco_time = datetime.now(self._TZ)
         return morocco_time.strftime('%Y-%m-%d %H:%M:%S')
 
     def get_output_file_name(self) -> str:
@@ -233,7 +461,7 @@ class ImprovedWebScraper:
         Returns:
             str: The formatted output file name.
         """
-        morocco_time = datetime.now(pytz.timezone('Africa/Casablanca'))
+        morocco_time = datetime.now(self._TZ)
         start_time_str = self.get_timestamp().replace(':', '_')
         end_time = morocco_time + dt.timedelta(seconds=self.duration)
         end_time_str = end_time.strftime('%Y-%m-%d_%H_%M_%S')
@@ -247,26 +475,65 @@ class ImprovedWebScraper:
         Returns:
             str: The formatted log file name.
         """
-        morocco_time = datetime.now(pytz.timezone('Africa/Casablanca'))
-        start_time_str = datetime.now(pytz.timezone('Africa/Casablanca')).strftime('%Y-%m-%d_%H_%M_%S')
+        morocco_time = datetime.now(self._TZ)
+        start_time_str = morocco_time.strftime('%Y-%m-%d_%H_%M_%S')
         end_time = morocco_time + dt.timedelta(seconds=self.duration)
         end_time_str = end_time.strftime('%Y-%m-%d_%H_%M_%S')
 
         return f"logs/log_{start_time_str}_to_{end_time_str}.txt"
 
-    def start_scraping(self) -> None:
+    def run_session(self, duration: Optional[int] = None) -> None:
         """
-        Starts the scraping process for the given duration:
+        Runs one scraping session on the already-initialized driver without
+        closing it afterwards, so a long-lived process can reuse the same
+        browser across sessions:
         1. Search for the dynamic crash game URL.
         2. Fetch data from that URL.
-        3. Close the driver at the end.
+
+        Args:
+            duration (int, optional): Duration in seconds for this session.
+                Defaults to the duration given at construction time.
         """
+        if duration is not None:
+            self.duration = duration
+        self.start_time = time.time()
+        self._last_x_text = ""
+        # Each session gets its own log file, as under the one-shot model;
+        # setup_logger swaps the handlers on the shared named logger
+        self.logger = setup_logger('ImprovedWebScraper', self.get_log_file_name())
         self.logger.info(f"Scraping will run for {self.duration} seconds.")
         try:
             self.url_crash_plane = self.search_for_url()
+            if not self.url_crash_plane:
+                # Stop was requested during the URL search
+                return
             self.fetch_data(self.url_crash_plane)
         except Exception as e:
             self.logger.error(f"Error in scraping process: {e}")
+
+    def stop(self) -> None:
+        """
+        Signals the running session to stop; the fetch loop exits at the next
+        iteration and flushes any buffered rows.
+        """
+        self.logger.info("Stop requested for the current scraping session.")
+        self._stop_event.set()
+
+    def reset_stop(self) -> None:
+        """
+        Clears any pending stop request. Called by the launcher before a new
+        session starts, never by the session itself, so a stop issued while
+        the session is still starting up is not erased.
+        """
+        self._stop_event.clear()
+
+    def start_scraping(self) -> None:
+        """
+        Starts a one-shot scraping process for the given duration and closes
+        the driver at the end.
+        """
+        try:
+            self.run_session()
         finally:
             self.close_driver()
 
@@ -290,4 +557,7 @@ def main(duration: float):
 
 
 if __name__ == "__main__":
+    # Imported here to avoid a circular import with the frontend
+    from app import SCRAP_DURATION
+
     main(SCRAP_DURATION)
\ No newline at end of file
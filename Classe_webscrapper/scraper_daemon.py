@@ -0,0 +1,165 @@
+import threading
+from multiprocessing.connection import Listener
+from typing import Optional, Tuple
+
+from logger import setup_logger
+from Classe_webscrapper.cls_webscrapper import ImprovedWebScraper
+
+# Address and key the frontend uses to reach the daemon.
+DAEMON_ADDRESS: Tuple[str, int] = ("127.0.0.1", 6543)
+DAEMON_AUTHKEY = b"scraping-web-crash"
+
+
+class ScraperDaemon:
+    """
+    A long-lived worker that keeps a single Chrome instance alive and runs
+    scraping sessions on request, so each session skips the ~2-5s browser
+    cold-start and chromedriver handshake paid by a fresh subprocess.
+
+    The daemon listens on a multiprocessing connection and accepts small
+    command dicts:
+    - {"cmd": "start", "duration": N}: start a session on the shared driver.
+    - {"cmd": "stop"}: stop the running session.
+    - {"cmd": "status"}: report whether a session is running.
+    - {"cmd": "shutdown"}: close the driver and exit the daemon.
+    """
+
+    def __init__(self, address: Tuple[str, int] = DAEMON_ADDRESS, authkey: bytes = DAEMON_AUTHKEY) -> None:
+        """
+        Initialize the ScraperDaemon.
+
+        Args:
+            address (tuple): Host/port the daemon listens on.
+            authkey (bytes): Shared secret for the multiprocessing connection.
+        """
+        self.address = address
+        self.authkey = authkey
+        self.scraper: Optional[ImprovedWebScraper] = None
+        self.session_thread: Optional[threading.Thread] = None
+        # Kept out of logs/*.txt so the UI's newest-log lookup never mistakes
+        # the control log for a session log
+        self.logger = setup_logger('ScraperDaemon', 'logs/daemon/scraper_daemon.txt')
+
+    def serve_forever(self) -> None:
+        """
+        Accept and handle commands until a shutdown command is received.
+        The driver is set up once, on the first start command.
+        """
+        self.logger.info(f"Scraper daemon listening on {self.address}.")
+        with Listener(self.address, authkey=self.authkey) as listener:
+            running = True
+            while running:
+                with listener.accept() as conn:
+                    try:
+                        message = conn.recv()
+                    except (EOFError, OSError) as e:
+                        self.logger.warning(f"Dropped connection before command: {e}")
+                        continue
+                    try:
+                        running = self._handle(conn, message)
+                    except Exception as e:
+                        # A bad command must not take down the daemon
+                        self.logger.error(f"Error handling command {message!r}: {e}")
+        self._close_scraper()
+        self.logger.info("Scraper daemon stopped.")
+
+    def _handle(self, conn, message: dict) -> bool:
+        """
+        Handle a single command message and reply on the connection.
+
+        Args:
+            conn: The accepted connection to reply on.
+            message (dict): The received command.
+
+        Returns:
+            bool: False if the daemon should shut down, True otherwise.
+        """
+        cmd = message.get("cmd") if isinstance(message, dict) else None
+        self.logger.info(f"Received command: {cmd}")
+        shutdown = False
+
+        if cmd == "start":
+            duration = message.get("duration", 180)
+            if isinstance(duration, (int, float)) and not isinstance(duration, bool) and duration > 0:
+                reply = self._start_session(int(duration))
+            else:
+                reply = {"ok": False, "error": f"Invalid duration: {duration!r}"}
+        elif cmd == "stop":
+            if self.scraper is not None:
+                self.scraper.stop()
+            reply = {"ok": True}
+        elif cmd == "status":
+            running = self.session_thread is not None and self.session_thread.is_alive()
+            reply = {"ok": True, "running": running}
+        elif cmd == "shutdown":
+            if self.scraper is not None:
+                self.scraper.stop()
+            reply = {"ok": True}
+            shutdown = True
+        else:
+            reply = {"ok": False, "error": f"Unknown command: {cmd}"}
+
+        try:
+            conn.send(reply)
+        except (OSError, EOFError) as e:
+            # The client may disconnect without waiting for the reply
+            self.logger.warning(f"Client vanished before reply to {cmd}: {e}")
+        return not shutdown
+
+    def _start_session(self, duration: int) -> dict:
+        """
+        Start a scraping session on the shared driver in a background thread.
+
+        Args:
+            duration (int): Duration in seconds for the session.
+
+        Returns:
+            dict: Reply to send back to the client.
+        """
+        if self.session_thread is not None and self.session_thread.is_alive():
+            return {"ok": False, "error": "A scraping session is already running."}
+
+        if self.scraper is None:
+            self.scraper = ImprovedWebScraper(duration=duration)
+        if self.scraper.driver is None:
+            # First start, or Chrome died since the last session
+            try:
+                self.scraper.setup_driver()
+            except Exception as e:
+                # Leave no half-initialized scraper behind, so the next start
+                # command retries the setup from scratch
+                self.scraper = None
+                self.logger.error(f"Driver setup failed: {e}")
+                return {"ok": False, "error": f"Driver setup failed: {e}"}
+
+        # Cleared here, not in run_session, so a stop that races session
+        # startup is still honored
+        self.scraper.reset_stop()
+        self.session_thread = threading.Thread(
+            target=self.scraper.run_session,
+            kwargs={"duration": duration},
+            daemon=True,
+        )
+        self.session_thread.start()
+        return {"ok": True}
+
+    def _close_scraper(self) -> None:
+        """
+        Wait for any running session to finish and close the shared driver.
+        """
+        if self.session_thread is not None and self.session_thread.is_alive():
+            self.session_thread.join(timeout=30)
+        if self.scraper is not None:
+            self.scraper.close_driver()
+            self.scraper = None
+
+
+def main() -> None:
+    """
+    Entry point to run the scraper daemon.
+    """
+    ScraperDaemon().serve_forever()
+
+
+if __name__ == "__main__":
+    main()
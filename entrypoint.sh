@@ -4,4 +4,6 @@ Xvfb :99 -screen 0 1920x1080x24 &
 export DISPLAY=:99
 # Sleep pour laisser Xvfb démarrer
 sleep 2
+# Start the scraper daemon so sessions reuse one Chrome instance
+python Classe_webscrapper/scraper_daemon.py &
 exec streamlit run app.py --server.headless true
@@ -1,17 +1,31 @@
 import os
+import re
 import time
-import glob
-import subprocess
-from typing import List, Optional
+import threading
+from collections import deque
+from multiprocessing.connection import Client
+from typing import List, Optional, Tuple
 import streamlit as st
 
-SCRAPER_COMMAND = ["python", "Classe_webscrapper/cls_webscrapper.py"]
+from Classe_webscrapper.cls_webscrapper import ImprovedWebScraper
+from Classe_webscrapper.scraper_daemon import DAEMON_ADDRESS, DAEMON_AUTHKEY
+
+# Maximum number of bytes read when catching up on a newly-seen log file.
+LOG_TAIL_BYTES = 256 * 1024
+
+# Maximum number of formatted log lines kept and displayed.
+MAX_LOG_LINES = 500
+
+# Compiled once: classify a log line's level with a single scan.
+_LEVEL_RE = re.compile(r" - (INFO|WARNING|ERROR) - ")
+_LEVEL_COLORS = {"INFO": "#0066cc", "WARNING": "#ff9900", "ERROR": "#cc0000"}
+_DEFAULT_COLOR = "#666"
 
 class ScraperUI:
     """
     A class to manage the Streamlit UI for controlling and monitoring a long-running scraping process.
     This class handles:
-    - Launching the scraping process in a separate subprocess.
+    - Launching the scraping process via the scraper daemon or a background thread.
     - Displaying a progress bar based on the elapsed time vs. the defined duration.
     - Displaying logs in real-time.
     - Stopping the scraping if an error appears in the logs or manually via a stop button.
@@ -31,8 +45,15 @@ class ScraperUI:
         if "scraping_started" not in st.session_state:
             st.session_state["scraping_started"] = False
             st.session_state["scraping_start_time"] = None
-            st.session_state["scraping_process"] = None
+            st.session_state["scraping_scraper"] = None
             st.session_state["scraping_error"] = False
+            # Incremental log-display state: formatted lines already rendered
+            # and the read position in the current log file
+            st.session_state["log_html"] = deque(maxlen=MAX_LOG_LINES)
+            st.session_state["log_file"] = None
+            st.session_state["log_offset"] = 0
+            st.session_state["log_partial"] = ""
+            st.session_state["log_skip_partial"] = False
 
     def run(self) -> None:
         """
@@ -100,11 +121,58 @@ class ScraperUI:
 
     def _start_scraping(self) -> None:
         """
-        Start the scraping process in a subprocess and set the session state variables.
+        Start a scraping session and set the session state variables.
+
+        Prefers the long-lived scraper daemon, which reuses a single Chrome
+        instance across sessions and skips the browser cold-start; otherwise
+        runs the scraper in a background thread of this process, avoiding the
+        interpreter cold start and process-boundary control that a subprocess
+        launch would pay.
         """
         st.session_state["scraping_started"] = True
         st.session_state["scraping_start_time"] = time.time()
-        st.session_state["scraping_process"] = subprocess.Popen(SCRAPER_COMMAND)
+        if self._send_daemon_command({"cmd": "start", "duration": self.duration}):
+            st.session_state["scraping_scraper"] = None
+        else:
+            scraper = ImprovedWebScraper(duration=self.duration)
+            scraper.reset_stop()
+            st.session_state["scraping_scraper"] = scraper
+            threading.Thread(target=self._run_scraper, args=(scraper,), daemon=True).start()
+
+    @staticmethod
+    def _run_scraper(scraper: ImprovedWebScraper) -> None:
+        """
+        Thread target: set up the driver and run one scraping session.
+        Errors are already logged by the scraper itself.
+
+        Args:
+            scraper (ImprovedWebScraper): The scraper instance to run.
+        """
+        try:
+            scraper.setup_driver()
+            scraper.start_scraping()
+        except Exception:
+            # setup_driver logs and re-raises; keep the thread from crashing
+            # the Streamlit process
+            pass
+
+    def _send_daemon_command(self, message: dict) -> bool:
+        """
+        Send a command to the scraper daemon if one is listening.
+
+        Args:
+            message (dict): The command to send, e.g. {"cmd": "start", ...}.
+
+        Returns:
+            bool: True if the daemon accepted the command, False otherwise.
+        """
+        try:
+            with Client(DAEMON_ADDRESS, authkey=DAEMON_AUTHKEY) as conn:
+                conn.send(message)
+                reply = conn.recv()
+            return bool(reply.get("ok"))
+        except (ConnectionRefusedError, OSError, EOFError):
+            return False
 
     def _stop_scraping(self, reason: str) -> None:
         """
@@ -113,9 +181,14 @@ class ScraperUI:
         Args:
             reason (str): A message indicating why the scraping was stopped.
         """
-        if st.session_state["scraping_process"] and st.session_state["scraping_process"].poll() is None:
-            st.session_state["scraping_process"].terminate()
-            st.session_state["scraping_process"].wait()
+        scraper = st.session_state["scraping_scraper"]
+        if scraper is not None:
+            # Cancellation via the scraper's stop event; the fetch loop exits
+            # and flushes on its next iteration
+            scraper.stop()
+            st.session_state["scraping_scraper"] = None
+        else:
+            self._send_daemon_command({"cmd": "stop"})
         st.session_state["scraping_started"] = False
         if "error" in reason.lower():
             st.session_state["scraping_error"] = True
@@ -133,27 +206,64 @@ class ScraperUI:
         """
         if not os.path.isdir(self.logs_dir):
             return None
-        log_files = glob.glob(os.path.join(self.logs_dir, "*.txt"))
-        if not log_files:
-            return None
-        log_files.sort(key=os.path.getmtime, reverse=True)
-        return log_files[0]
+        # Single O(N) pass; DirEntry.stat() reuses the data from the directory
+        # scan instead of issuing one stat call per file.
+        with os.scandir(self.logs_dir) as entries:
+            newest = max(
+                (entry for entry in entries if entry.name.endswith(".txt")),
+                key=lambda entry: entry.stat().st_mtime,
+                default=None,
+            )
+        return newest.path if newest else None
 
-    def _load_logs(self, log_file_path: str) -> List[str]:
+    def _load_logs(self, log_file_path: str) -> Tuple[List[str], str]:
         """
-        Load logs from a given file path.
+        Read only the log lines appended since the previous refresh. The read
+        position is kept in session state; a newly-seen log file starts from
+        at most LOG_TAIL_BYTES before its end so the catch-up read is bounded.
 
         Args:
             log_file_path (str): The path to the log file.
 
         Returns:
-            List[str]: List of log lines.
+            Tuple[List[str], str]: New complete log lines since the last
+            call, and the decoded delta text (including any carried-over
+            partial line) for fast substring scans.
         """
         if not os.path.exists(log_file_path):
-            return []
-        with open(log_file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        return lines
+            return [], ""
+
+        state = st.session_state
+        with open(log_file_path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if state["log_file"] != log_file_path:
+                # New or rotated log file: reset and catch up from its tail
+                state["log_file"] = log_file_path
+                state["log_offset"] = max(0, size - LOG_TAIL_BYTES)
+                state["log_partial"] = ""
+                state["log_skip_partial"] = state["log_offset"] > 0
+                state["log_html"].clear()
+            if size < state["log_offset"]:
+                # File shrank (truncated/rewritten); start over
+                state["log_offset"] = 0
+                state["log_partial"] = ""
+            f.seek(state["log_offset"])
+            chunk = f.read()
+            state["log_offset"] += len(chunk)
+
+        text = state["log_partial"] + chunk.decode('utf-8', errors='replace')
+        lines = text.splitlines(keepends=True)
+        if lines and not lines[-1].endswith("\n"):
+            # Keep the incomplete trailing line for the next refresh
+            state["log_partial"] = lines.pop()
+        else:
+            state["log_partial"] = ""
+        if lines and state["log_skip_partial"]:
+            # The catch-up seek likely landed mid-line; drop the first line
+            lines = lines[1:]
+            state["log_skip_partial"] = False
+        return lines, text
 
     def _format_log_line(self, line: str) -> str:
         """
@@ -165,14 +275,9 @@ class ScraperUI:
         Returns:
             str: HTML-formatted line.
         """
-        if " - INFO - " in line:
-            return f"<p style='color: #0066cc;'>{line.strip()}</p>"
-        elif " - WARNING - " in line:
-            return f"<p style='color: #ff9900;'>{line.strip()}</p>"
-        elif " - ERROR - " in line:
-            return f"<p style='color: #cc0000;'>{line.strip()}</p>"
-        else:
-            return f"<p style='color: #666;'>{line.strip()}</p>"
+        match = _LEVEL_RE.search(line)
+        color = _LEVEL_COLORS.get(match.group(1), _DEFAULT_COLOR) if match else _DEFAULT_COLOR
+        return f"<p style='color: {color};'>{line.strip()}</p>"
 
     def _display_logs(self) -> None:
         """
@@ -183,24 +288,26 @@ class ScraperUI:
             st.info("No log files found yet. Please wait.")
             return
 
-        lines = self._load_logs(most_recent_log)
-        if not lines:
-            st.info("Log file exists but is empty. Please wait.")
-            return
+        new_lines, new_text = self._load_logs(most_recent_log)
 
-        # Check for error lines
-        error_found = any(" - ERROR - " in line for line in lines)
-        if error_found:
+        # One C-level substring scan over the delta text; it includes the
+        # carried-over partial line, so a marker split across two reads is
+        # still caught
+        if " - ERROR - " in new_text:
             self._stop_scraping("Scraping stopped due to an ERROR in logs.")
             return
 
-        # Limit the number of displayed lines
-        max_lines = 500
-        if len(lines) > max_lines:
-            lines = lines[-max_lines:]
-        formatted_lines = [self._format_log_line(line) for line in lines]
-        st.markdown("<br>".join(formatted_lines), unsafe_allow_html=True)
-        st.write(f"Displayed {len(lines)} lines from file: {most_recent_log}")
+        # Only the lines appended since the last refresh are formatted; the
+        # deque keeps the most recent MAX_LOG_LINES already-formatted lines
+        rendered = st.session_state["log_html"]
+        rendered.extend(self._format_log_line(line) for line in new_lines)
+        if not rendered:
+            st.info("Log file exists but is empty. Please wait.")
+            return
+
+        log_box = st.empty()
+        log_box.markdown("<br>".join(rendered), unsafe_allow_html=True)
+        st.write(f"Displayed {len(rendered)} lines from file: {most_recent_log}")
         st.write(f"Last updated at {time.strftime('%Y-%m-%d %H:%M:%S')}.")
         
         
@@ -28,6 +28,13 @@ def setup_logger(name: str, log_file: str, level=logging.INFO) -> logging.Logger
     logger = logging.getLogger(name)
     logger.setLevel(level)
 
+    # Drop handlers left over from a previous session on the same named
+    # logger, so repeated setup calls in one process do not duplicate output
+    # or keep writing to (and leaking) old log files
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
     # Add handlers to the logger
     logger.addHandler(file_handler)
     logger.addHandler(stream_handler)